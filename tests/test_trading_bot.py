@@ -0,0 +1,68 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+import orjson
+import requests.models
+
+import trading_bot  # noqa: F401 - installs the orjson JSON backend on import
+
+
+class OrjsonBackendTest(unittest.TestCase):
+    """requests responses and request bodies go through the patched orjson backend."""
+
+    def test_backend_installed(self):
+        self.assertIs(requests.models.complexjson.loads, orjson.loads)
+
+    def test_ticker_price_round_trips(self):
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = b'{"symbol":"BTCUSDT","price":"1.23"}'
+
+        ticker = response.json()
+
+        self.assertEqual(ticker['price'], '1.23')
+        self.assertEqual(float(ticker['price']), 1.23)
+
+    def test_invalid_json_still_raises_value_error(self):
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = b'{"price":'
+
+        with self.assertRaises(ValueError):
+            response.json()
+
+    def test_json_request_body_uses_dumps(self):
+        # prepare_body calls complexjson.dumps(json, allow_nan=False)
+        request = requests.models.PreparedRequest()
+        request.prepare(method='POST', url='https://testnet.binancefuture.com', json={'price': '1.23'})
+
+        self.assertIsInstance(request.body, bytes)
+        self.assertEqual(orjson.loads(request.body), {'price': '1.23'})
+        self.assertEqual(request.headers['Content-Type'], 'application/json')
+
+
+class FormatAccountInfoTest(unittest.TestCase):
+    """Positions are filtered on the numeric size but displayed with the exchange's string."""
+
+    def test_position_size_keeps_exchange_string(self):
+        bot = trading_bot.BinanceFuturesBot.__new__(trading_bot.BinanceFuturesBot)
+        bot._state = None
+        bot._stream_transport = None
+        bot._account_cache = ({'positions': [
+            {'symbol': 'BTCUSDT', 'positionAmt': '0.010', 'entryPrice': '60000', 'unrealizedProfit': '-1.5'},
+            {'symbol': 'ETHUSDT', 'positionAmt': '0.000', 'entryPrice': '0', 'unrealizedProfit': '0'},
+            {'symbol': 'DOGEUSDT', 'positionAmt': '0.00001', 'entryPrice': '3', 'unrealizedProfit': '2'},
+        ]}, float('inf'))
+
+        output = io.StringIO()
+        with redirect_stdout(output), self.assertLogs(trading_bot.logger, 'INFO'):
+            trading_bot.format_account_info(bot.get_account_info())
+
+        self.assertIn("Size: 0.010\n", output.getvalue())
+        self.assertIn("Size: 0.00001\n", output.getvalue())
+        self.assertNotIn("ETHUSDT", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
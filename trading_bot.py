@@ -7,7 +7,7 @@ This is a complete implementation of a Binance Futures trading bot for testnet.
 The bot includes all required features plus advanced functionality.
 
 Setup Instructions:
-1. Install required packages: pip install python-binance python-dotenv
+1. Install required packages: pip install -r requirements.txt
 2. Create account at https://testnet.binancefuture.com
 3. Generate API keys from the testnet interface
 4. Create .env file with your credentials
@@ -18,37 +18,286 @@ Date: July 2025
 """
 
 import os
+import sys
+import asyncio
+import atexit
+import socket
+import threading
+import hashlib
+import hmac
 import logging
+import logging.handlers
+import queue
 import time
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from decimal import Decimal, ROUND_DOWN
+from types import SimpleNamespace
 import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse
 
 try:
     from binance.client import Client
     from binance.exceptions import BinanceAPIException, BinanceOrderException
     from dotenv import load_dotenv
+    import httpx
+    import numpy as np
+    import orjson
+    import requests.models
+    from picows import WSFrame, WSListener, WSMsgType, WSTransport, ws_connect
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit.history import InMemoryHistory
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError as e:
     print(f"Missing required package: {e}")
-    print("Please install with: pip install python-binance python-dotenv")
+    print("Please install with: pip install -r requirements.txt")
     exit(1)
 
+# Decode every python-binance (requests) response with orjson instead of stdlib json
+requests.models.complexjson = SimpleNamespace(
+    loads=orjson.loads,
+    dumps=lambda obj, **kwargs: orjson.dumps(obj).decode()
+)
+
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging: callers only enqueue records, a background listener
+# thread does the file and console I/O
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler('trading_bot.log')
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on exit
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('trading_bot.log'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',  # Leave the message bare; the listener's handlers format it
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 
 logger = logging.getLogger(__name__)
 
+# HTTP connection pool settings for the REST session
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+RETRY_STATUS_CODES = [500, 502, 503, 504]
+
+# 429 handling: retried by the bot (re-signed each attempt), never for 418 bans
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 0.5
+MAX_RATE_LIMIT_WAIT = 5.0  # Longer Retry-After values fail fast instead of hanging
+
+# Client-side request budget, kept under the exchange's per-minute limit
+REQUEST_LIMIT = 1200
+REQUEST_INTERVAL = 60.0
+
+# Send small order payloads immediately (no Nagle) and keep idle connections alive
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+
+# Valid order sides
+SIDE_VALIDATOR = {'BUY', 'SELL'}
+_SIDES = {'BUY': 'BUY', 'SELL': 'SELL', 'buy': 'BUY', 'sell': 'SELL'}
+
+@lru_cache(maxsize=256)
+def _usym(symbol: str) -> str:
+    """Return the uppercased symbol, memoized across calls."""
+    return symbol.upper()
+
+def _uside(side: str) -> str:
+    """Return the uppercased order side, using a lookup for the common spellings."""
+    return _SIDES.get(side) or side.upper()
+
+def quantize(value: float, step: Optional[Decimal]) -> str:
+    """
+    Round a value down to a multiple of an exchange filter step.
+    
+    Args:
+        value: Quantity or price
+        step: LOT_SIZE stepSize / PRICE_FILTER tickSize (None leaves the value as is)
+        
+    Returns:
+        Plain decimal string suitable for the API
+    """
+    amount = Decimal(str(value))
+    if step:
+        amount = (amount / step).to_integral_value(rounding=ROUND_DOWN) * step
+    return format(amount.normalize(), 'f')
+
+# Default cache lifetimes (seconds)
+PRICE_CACHE_TTL = 0.5
+ACCOUNT_CACHE_TTL = 2.0
+STATE_TTL = 60.0  # Open orders snapshot while the user stream reports every order change
+STATE_FALLBACK_TTL = 2.0  # Open orders snapshot while the user stream is off or reconnecting
+
+# REST endpoints used by the async client
+FUTURES_TESTNET_URL = 'https://testnet.binancefuture.com'
+FUTURES_LIVE_URL = 'https://fapi.binance.com'
+
+# User data stream endpoints and timings
+FUTURES_TESTNET_WS_URL = 'wss://stream.binancefuture.com/ws'
+FUTURES_LIVE_WS_URL = 'wss://fstream.binance.com/ws'
+LISTEN_KEY_KEEPALIVE = 30 * 60
+USER_STREAM_RECONNECT_DELAY = 5
+USER_STREAM_MAX_RECONNECT_DELAY = 300
+USER_STREAM_STOP_TIMEOUT = 2
+
+# Connection limits for the async client
+ASYNC_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30)
+
+# Well-known rate limit error, matched on the raw body so it is never JSON-decoded
+RATE_LIMIT_MARKER = b'"code":-1003'
+RATE_LIMIT_BODY = '{"code":-1003,"msg":"Too much request weight used; current limit exceeded."}'
+
+def raise_fast_error(response, *args, **kwargs) -> None:
+    """
+    Response hook that raises BinanceAPIException for -1003 responses
+    from the constant RATE_LIMIT_BODY, without decoding the real body.
+    The real response is kept on the exception (e.g. for Retry-After).
+    """
+    if response.status_code == 429 and RATE_LIMIT_MARKER in response.content:
+        raise BinanceAPIException(response, 429, RATE_LIMIT_BODY)
+
+def rate_limit_wait(error: BinanceAPIException, attempt: int) -> Optional[float]:
+    """
+    Decide whether a failed request should be retried.
+    
+    Args:
+        error: Exception raised for the request
+        attempt: Number of retries already made
+        
+    Returns:
+        Seconds to wait before retrying, or None to re-raise (not a 429,
+        retries exhausted, or Retry-After longer than MAX_RATE_LIMIT_WAIT)
+    """
+    if error.status_code != 429 or attempt >= RATE_LIMIT_RETRIES:
+        return None
+    headers = getattr(error.response, 'headers', None) or {}
+    retry_after = headers.get('Retry-After')
+    try:
+        wait = float(retry_after) if retry_after else RATE_LIMIT_BACKOFF * 2 ** attempt
+    except ValueError:
+        return None
+    return wait if wait <= MAX_RATE_LIMIT_WAIT else None
+
+class RateLimiter:
+    """
+    Sliding-window limiter allowing at most `limit` requests per `interval`
+    seconds, shared by the sync session and the async client.
+    """
+    
+    def __init__(self, limit: int = REQUEST_LIMIT, interval: float = REQUEST_INTERVAL):
+        self.interval = interval
+        self._timestamps = deque(maxlen=limit)
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Claim the next request slot and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if len(self._timestamps) == self._timestamps.maxlen:
+                wait = max(0.0, self._timestamps[0] + self.interval - now)
+            self._timestamps.append(now + wait)
+            return wait
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait:
+            logger.info("Request budget exhausted, waiting %.2fs", wait)
+            time.sleep(wait)
+    
+    async def aacquire(self) -> None:
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self._reserve()
+        if wait:
+            logger.info("Request budget exhausted, waiting %.2fs", wait)
+            await asyncio.sleep(wait)
+
+class LowLatencyAdapter(HTTPAdapter):
+    """
+    HTTP adapter whose pooled connections use SOCKET_OPTIONS, rate limited
+    client-side. When endpoint_ip is set, requests to pinned_host connect to
+    that IP directly (skipping DNS) while keeping SNI, certificate checks and
+    the Host header on pinned_host.
+    """
+    
+    def __init__(self, *args, rate_limiter: Optional[RateLimiter] = None,
+                 endpoint_ip: Optional[str] = None, pinned_host: Optional[str] = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.endpoint_ip = endpoint_ip
+        self.pinned_host = pinned_host
+        super().__init__(*args, **kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+    
+    def _is_pinned(self, url: str) -> bool:
+        return bool(self.endpoint_ip) and urlparse(url).hostname == self.pinned_host
+    
+    def _pinned_connection(self, url: str):
+        """Get a connection pool to endpoint_ip that verifies pinned_host."""
+        parsed = urlparse(url)
+        return self.poolmanager.connection_from_host(
+            self.endpoint_ip,
+            port=parsed.port or 443,
+            scheme=parsed.scheme,
+            pool_kwargs={'server_hostname': self.pinned_host, 'assert_hostname': self.pinned_host}
+        )
+    
+    def get_connection(self, url, proxies=None):
+        if self._is_pinned(url):
+            return self._pinned_connection(url)
+        return super().get_connection(url, proxies)
+    
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        # Used instead of get_connection by requests >= 2.32
+        if self._is_pinned(request.url):
+            return self._pinned_connection(request.url)
+        return super().get_connection_with_tls_context(request, verify, proxies, cert)
+    
+    def send(self, request, **kwargs):
+        if self._is_pinned(request.url):
+            request.headers['Host'] = self.pinned_host
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        start = time.perf_counter_ns()
+        response = super().send(request, **kwargs)
+        response.send_ns = time.perf_counter_ns() - start  # Time on the wire, after the budget wait
+        return response
+
+class UserStreamListener(WSListener):
+    """picows listener that feeds user data stream frames to the bot's order cache."""
+    
+    def __init__(self, bot: 'BinanceFuturesBot'):
+        self.bot = bot
+    
+    def on_ws_connected(self, transport: WSTransport):
+        logger.info("User data stream connected")
+    
+    def on_ws_frame(self, transport: WSTransport, frame: WSFrame):
+        if frame.msg_type == WSMsgType.TEXT:
+            event = orjson.loads(frame.get_payload_as_memoryview())
+            if not self.bot._handle_user_event(event):
+                transport.disconnect()
+        elif frame.msg_type == WSMsgType.CLOSE:
+            transport.send_close(frame.get_close_code(), frame.get_close_message())
+            transport.disconnect()
+
 class BinanceFuturesBot:
     """
     A comprehensive Binance Futures trading bot with full functionality.
@@ -62,7 +311,8 @@ class BinanceFuturesBot:
     - Detailed logging
     """
     
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 user_stream: bool = True, endpoint_ip: Optional[str] = None):
         """
         Initialize the trading bot.
         
@@ -70,10 +320,43 @@ class BinanceFuturesBot:
             api_key: Binance API key
             api_secret: Binance API secret
             testnet: Use testnet environment (default: True)
+            user_stream: Track order updates over the user data WebSocket (default: True)
+            endpoint_ip: Optional IP of the preferred REST edge server, used instead of DNS
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
+        self.endpoint_ip = endpoint_ip
+        self.base_url = FUTURES_TESTNET_URL if testnet else FUTURES_LIVE_URL
+        self.rest_host = urlparse(self.base_url).hostname
+        self.ws_url = FUTURES_TESTNET_WS_URL if testnet else FUTURES_LIVE_WS_URL
+        
+        # Orders seen on the user data stream: orderId -> order status
+        self._orders: Dict[int, Dict] = {}
+        self._stream_stop = threading.Event()
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stream_transport: Optional[WSTransport] = None
+        
+        # TTL caches: symbol -> (price, expiry) and (account response, expiry)
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._account_cache: Optional[Tuple[Dict, float]] = None
+        
+        # Snapshot of account + all open orders fetched together by refresh_state()
+        self._state: Optional[Dict] = None
+        self._state_generation = 0  # Bumped on every invalidation
+        
+        # Columnar (structure-of-arrays) view of the latest non-zero positions
+        self._pos_soa: Dict[str, np.ndarray] = {}
+        
+        # Lot size step / price tick per symbol, loaded once from exchange info
+        self._symbol_filters: Optional[Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]]] = None
+        
+        # Client-side request budget shared by all REST paths
+        self._rate_limiter = RateLimiter()
+        
+        # Per-stage latency counters: stage -> [operations, total_ns, max_ns]
+        self._latency: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
         
         # Initialize Binance client
         try:
@@ -89,20 +372,368 @@ class BinanceFuturesBot:
             else:
                 self.client = Client(api_key=api_key, api_secret=api_secret)
                 logger.info("Connected to Binance Futures Live")
+            
+            self._configure_session()
+            self._draft_headers = {
+                'X-MBX-APIKEY': api_key,
+                'Content-Type': 'application/x-www-form-urlencoded'
+            }
+            
+            # Async client for concurrent requests, driven by a dedicated event loop
+            # so pooled connections stay bound to the same loop across calls
+            self._loop = asyncio.new_event_loop()
+            # With a pinned endpoint, connect to the IP and send SNI/Host for the real host
+            async_headers = {'X-MBX-APIKEY': api_key}
+            async_base_url = self.base_url
+            self._async_extensions = None
+            if endpoint_ip:
+                ip_host = f"[{endpoint_ip}]" if ':' in endpoint_ip else endpoint_ip
+                async_base_url = f"https://{ip_host}"
+                async_headers['Host'] = self.rest_host
+                self._async_extensions = {'sni_hostname': self.rest_host}
+            self.async_client = httpx.AsyncClient(
+                base_url=async_base_url,
+                headers=async_headers,
+                transport=httpx.AsyncHTTPTransport(
+                    limits=ASYNC_LIMITS,
+                    http2=True,
+                    socket_options=SOCKET_OPTIONS
+                ),
+                timeout=10
+            )
+            
+            if user_stream:
+                self._stream_thread = threading.Thread(target=self._run_user_stream,
+                                                       name='user-stream', daemon=True)
+                self._stream_thread.start()
                 
         except Exception as e:
-            logger.error(f"Failed to initialize Binance client: {e}")
+            logger.error("Failed to initialize Binance client: %s", e)
             raise
     
-    def get_account_info(self) -> Dict:
+    def _configure_session(self) -> None:
+        """
+        Mount a pooled low-latency HTTP adapter on the client session so that
+        every futures_* call reuses an open TLS connection instead of doing a
+        fresh handshake per request and stays within the client-side request
+        budget. Only server errors are retried here, with a short total
+        backoff: urllib3 resends signed requests unchanged, so waits must stay
+        well inside recvWindow. Rate limits are retried by _call().
+        """
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=False,
+            raise_on_status=False  # Let the final response reach BinanceAPIException
+        )
+        adapter = LowLatencyAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retry,
+            rate_limiter=self._rate_limiter,
+            endpoint_ip=self.endpoint_ip,
+            pinned_host=self.rest_host
+        )
+        self.client.session.mount('https://', adapter)
+        self.client.session.headers['Connection'] = 'keep-alive'
+        self.client.session.hooks['response'].append(raise_fast_error)
+    
+    def _call(self, fn: Callable, *args, _stage: Optional[str] = None, **kwargs):
+        """
+        Call a REST function, re-issuing it after short waits on 429
+        responses. Each attempt goes through python-binance (or send_draft)
+        again, so it is signed with a fresh timestamp. With _stage set, every
+        attempt is recorded as its own latency sample, excluding the backoff.
+        """
+        attempt = 0
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            except BinanceAPIException as e:
+                wait = rate_limit_wait(e, attempt)
+                if wait is None:
+                    raise
+            finally:
+                if _stage:
+                    self._record_latency(_stage, start)
+            logger.info("Rate limited, retrying in %.2fs", wait)
+            time.sleep(wait)
+            attempt += 1
+    
+    def _record_latency(self, stage: str, start_ns: int) -> None:
+        """Add the time elapsed since start_ns to the counters for a stage."""
+        self._add_latency(stage, time.perf_counter_ns() - start_ns)
+    
+    def _add_latency(self, stage: str, elapsed: int) -> None:
+        """Add one measured duration in nanoseconds to the counters for a stage."""
+        stats = self._latency[stage]
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed > stats[2]:
+            stats[2] = elapsed
+    
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """
+        Summarize recorded latencies per stage.
+        
+        Returns:
+            Dict mapping stage name to operations, average and max time in microseconds
+        """
+        return {
+            stage: {
+                'operations': ops,
+                'avg_us': total / ops / 1000 if ops else 0.0,
+                'max_us': max_ns / 1000
+            }
+            for stage, (ops, total, max_ns) in self._latency.items()
+        }
+    
+    def _sign(self, params: Dict) -> str:
+        """
+        Build a signed query string for a private endpoint.
+        
+        Args:
+            params: Request parameters (timestamp must already be set)
+            
+        Returns:
+            URL-encoded query string with the HMAC-SHA256 signature appended
+        """
+        query = urlencode(params)
+        signature = hmac.new(self.api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+        return f"{query}&signature={signature}"
+    
+    @staticmethod
+    def _handle_rest_response(response) -> Dict:
+        """Raise BinanceAPIException for error responses, otherwise decode the JSON body."""
+        if not 200 <= response.status_code < 300:
+            raise_fast_error(response)
+            raise BinanceAPIException(response, response.status_code, response.text)
+        return orjson.loads(response.content)
+    
+    async def _arequest(self, method: str, path: str, params: Optional[Dict] = None,
+                        signed: bool = False) -> Dict:
+        """
+        Issue a REST request through the async client.
+        
+        Args:
+            method: HTTP method
+            path: Endpoint path (e.g., '/fapi/v1/order')
+            params: Request parameters
+            signed: Whether the endpoint requires a signature
+            
+        Returns:
+            Decoded JSON response
+        """
+        params = dict(params or {})
+        attempt = 0
+        while True:
+            # Sign every attempt so retries carry a fresh timestamp
+            if signed:
+                params['timestamp'] = int(time.time() * 1000)
+                query = self._sign(params)
+            else:
+                query = urlencode(params)
+            
+            url = f"{path}?{query}" if query else path
+            await self._rate_limiter.aacquire()
+            response = await self.async_client.request(method, url, extensions=self._async_extensions)
+            try:
+                return self._handle_rest_response(response)
+            except BinanceAPIException as e:
+                wait = rate_limit_wait(e, attempt)
+                if wait is None:
+                    raise
+                logger.info("Rate limited, retrying in %.2fs", wait)
+                await asyncio.sleep(wait)
+                attempt += 1
+    
+    def run_async(self, coro):
+        """Run a coroutine on the bot's event loop and return its result."""
+        return self._loop.run_until_complete(coro)
+    
+    def _run_user_stream(self) -> None:
+        """Thread target: run the user data stream listener on its own event loop."""
+        asyncio.run(self._listen_user_stream())
+    
+    async def _listen_user_stream(self) -> None:
+        """
+        Keep a user data stream subscription open and mirror
+        ORDER_TRADE_UPDATE events into self._orders, reconnecting with
+        exponential backoff until close() sets the stop event.
+        """
+        self._stream_loop = asyncio.get_running_loop()
+        delay = USER_STREAM_RECONNECT_DELAY
+        last_error = None
+        while not self._stream_stop.is_set():
+            try:
+                listen_key = await asyncio.to_thread(self._call, self.client.futures_stream_get_listen_key)
+                transport, _ = await ws_connect(lambda: UserStreamListener(self),
+                                                f"{self.ws_url}/{listen_key}")
+                self._stream_transport = transport
+                self._invalidate_state()  # Changes made before connecting were not seen
+                delay = USER_STREAM_RECONNECT_DELAY
+                last_error = None
+                keepalive = asyncio.create_task(self._keepalive_listen_key(listen_key))
+                try:
+                    await transport.wait_disconnected()
+                finally:
+                    keepalive.cancel()
+                    self._stream_transport = None
+                        
+            except Exception as e:
+                # Report each distinct failure once instead of on every retry
+                if str(e) != last_error:
+                    logger.error("User data stream error: %s (retrying in %ss)", e, delay)
+                    last_error = str(e)
+                delay = min(delay * 2, USER_STREAM_MAX_RECONNECT_DELAY)
+            
+            # Updates may have been missed while disconnected; fall back to REST
+            self._orders.clear()
+            await asyncio.to_thread(self._stream_stop.wait, delay)
+    
+    async def _keepalive_listen_key(self, listen_key: str) -> None:
+        """Periodically extend the listen key so the stream is not closed."""
+        while True:
+            await asyncio.sleep(LISTEN_KEY_KEEPALIVE)
+            try:
+                await asyncio.to_thread(self._call, self.client.futures_stream_keepalive, listen_key)
+            except Exception as e:
+                logger.error("Failed to keep user data stream alive: %s", e)
+    
+    def _handle_user_event(self, event: Dict) -> bool:
+        """
+        Apply a user data stream event to the order cache.
+        
+        Args:
+            event: Decoded stream event
+            
+        Returns:
+            False if the stream must be reopened, True otherwise
+        """
+        event_type = event.get('e')
+        if event_type == 'ORDER_TRADE_UPDATE':
+            update = event['o']
+            self._invalidate_state()
+            cached = self._orders.get(update['i'])
+            if cached is None and update['x'] != 'NEW':
+                # Creation time (REST 'time') is only known from the NEW event;
+                # orders first seen later are left to the REST path
+                return True
+            self._orders[update['i']] = {
+                'orderId': update['i'],
+                'symbol': update['s'],
+                'status': update['X'],
+                'type': update['o'],
+                'side': update['S'],
+                'origQty': update['q'],
+                'executedQty': update['z'],
+                'price': update['p'],
+                'avgPrice': update['ap'],
+                'time': cached['time'] if cached else update['T']
+            }
+        elif event_type == 'listenKeyExpired':
+            logger.info("User data stream listen key expired, reconnecting")
+            return False
+        return True
+    
+    def _stop_user_stream(self) -> None:
+        """Signal the user data stream thread to exit and wait briefly for it."""
+        self._stream_stop.set()
+        if not self._stream_thread:
+            return
+        try:
+            loop, transport = self._stream_loop, self._stream_transport
+            if loop and transport:
+                loop.call_soon_threadsafe(transport.disconnect)
+        except RuntimeError:
+            pass  # Stream loop already finished
+        self._stream_thread.join(timeout=USER_STREAM_STOP_TIMEOUT)
+    
+    def close(self) -> None:
+        """Stop the user data stream and close the async client and its event loop."""
+        self._stop_user_stream()
+        try:
+            self.run_async(self.async_client.aclose())
+            self._loop.close()
+        except Exception as e:
+            logger.error("Error closing async client: %s", e)
+    
+    def refresh_state(self) -> Dict:
+        """
+        Fetch account information and all open orders concurrently in one
+        round of requests, for subsequent menu actions to reuse.
+        
+        Returns:
+            State dictionary with 'account', 'open_orders' and 'timestamp'
+        """
+        try:
+            generation = self._state_generation
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                account, open_orders = pool.map(
+                    self._call,
+                    [self.client.futures_account, self.client.futures_get_open_orders]
+                )
+            
+            state = {
+                'account': account,
+                'open_orders': open_orders,
+                'timestamp': time.monotonic()
+            }
+            # An order changed while fetching; the result may already be stale
+            if generation == self._state_generation:
+                self._state = state
+            logger.info("Account state refreshed")
+            return state
+            
+        except BinanceAPIException as e:
+            logger.error("API error refreshing account state: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error refreshing account state: %s", e)
+            raise
+    
+    def _fresh_state(self, max_age: float = STATE_TTL) -> Optional[Dict]:
+        """
+        Return the refresh_state() snapshot if it is younger than max_age.
+        Without a connected user stream nothing reports outside changes, so
+        the age is capped at STATE_FALLBACK_TTL.
+        """
+        if self._stream_transport is None:
+            max_age = min(max_age, STATE_FALLBACK_TTL)
+        state = self._state
+        if max_age > 0 and state and time.monotonic() - state['timestamp'] < max_age:
+            return state
+        return None
+    
+    def _invalidate_state(self) -> None:
+        """Drop cached account data and open orders after an order changes."""
+        self._account_cache = None
+        self._state = None
+        self._state_generation += 1
+    
+    def get_account_info(self, max_age: float = ACCOUNT_CACHE_TTL) -> Dict:
         """
         Get futures account information including balances and positions.
         
+        Args:
+            max_age: Maximum age in seconds of a cached response (0 forces a refresh)
+            
         Returns:
             Dict containing account information
         """
         try:
-            account_info = self.client.futures_account()
+            now = time.monotonic()
+            cached = self._account_cache
+            state = self._fresh_state(max_age)
+            if state:
+                account_info = state['account']
+            elif max_age > 0 and cached and cached[1] > now:
+                account_info = cached[0]
+            else:
+                account_info = self._call(self.client.futures_account)
+                self._account_cache = (account_info, now + max_age)
             
             # Extract relevant information
             account_data = {
@@ -111,53 +742,202 @@ class BinanceFuturesBot:
                 'total_margin_balance': account_info.get('totalMarginBalance', '0'),
                 'available_balance': account_info.get('availableBalance', '0'),
                 'max_withdraw_amount': account_info.get('maxWithdrawAmount', '0'),
-                'positions': []
             }
             
-            # Get positions with non-zero size
-            for position in account_info.get('positions', []):
-                if float(position.get('positionAmt', 0)) != 0:
-                    account_data['positions'].append({
-                        'symbol': position.get('symbol'),
-                        'size': position.get('positionAmt'),
-                        'entry_price': position.get('entryPrice'),
-                        'unrealized_pnl': position.get('unrealizedPnL'),
-                        'percentage': position.get('percentage')
-                    })
+            # Build columnar position arrays and keep rows with non-zero size
+            positions = account_info.get('positions', [])
+            soa = {
+                'symbol': np.array([p.get('symbol', '') for p in positions], dtype=str),
+                'size': np.array([str(p.get('positionAmt', '0')) for p in positions], dtype=str),
+                'amount': np.asarray([p.get('positionAmt', 0) for p in positions], dtype=np.float64),
+                'entry_price': np.asarray([p.get('entryPrice', 0) for p in positions], dtype=np.float64),
+                'unrealized_pnl': np.asarray(
+                    [p.get('unrealizedProfit', p.get('unrealizedPnL', 0)) for p in positions],
+                    dtype=np.float64
+                ),
+                'percentage': np.array([str(p.get('percentage')) for p in positions], dtype=str)
+            }
+            mask = np.where(soa['amount'] != 0)[0]
+            self._pos_soa = {key: column[mask] for key, column in soa.items()}
+            account_data['positions'] = self._pos_soa
             
             logger.info("Account information retrieved successfully")
             return account_data
             
         except BinanceAPIException as e:
-            logger.error(f"API error getting account info: {e}")
+            logger.error("API error getting account info: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error getting account info: {e}")
+            logger.error("Unexpected error getting account info: %s", e)
             raise
     
-    def get_current_price(self, symbol: str) -> float:
+    def get_current_price(self, symbol: str, max_age: float = PRICE_CACHE_TTL) -> float:
         """
         Get current price for a symbol.
         
         Args:
             symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            max_age: Maximum age in seconds of a cached price (0 forces a refresh)
             
         Returns:
             Current price as float
         """
         try:
-            ticker = self.client.futures_symbol_ticker(symbol=symbol.upper())
+            symbol = _usym(symbol)
+            now = time.monotonic()
+            cached = self._price_cache.get(symbol)
+            if max_age > 0 and cached and cached[1] > now:
+                return cached[0]
+            
+            ticker = self._call(self.client.futures_symbol_ticker, symbol=symbol)
             price = float(ticker['price'])
-            logger.info(f"Current price for {symbol}: ${price:,.2f}")
+            self._price_cache[symbol] = (price, now + max_age)
+            logger.info("Current price for %s: $%.2f", symbol, price)
             return price
             
         except BinanceAPIException as e:
-            logger.error(f"API error getting price for {symbol}: {e}")
+            logger.error("API error getting price for %s: %s", symbol, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error getting price for {symbol}: {e}")
+            logger.error("Unexpected error getting price for %s: %s", symbol, e)
             raise
     
+    def _filters(self, symbol: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """
+        Get the lot size step and price tick for a symbol. Exchange info is
+        fetched on first use and kept for the lifetime of the bot.
+        
+        Args:
+            symbol: Uppercase trading pair symbol
+            
+        Returns:
+            (stepSize, tickSize), None for filters the symbol does not define
+        """
+        if self._symbol_filters is None:
+            symbol_filters = {}
+            for info in self._call(self.client.futures_exchange_info)['symbols']:
+                filters = {f['filterType']: f for f in info.get('filters', [])}
+                step = filters.get('LOT_SIZE', {}).get('stepSize')
+                tick = filters.get('PRICE_FILTER', {}).get('tickSize')
+                symbol_filters[info['symbol']] = (Decimal(step) if step else None,
+                                                  Decimal(tick) if tick else None)
+            self._symbol_filters = symbol_filters
+        return self._symbol_filters.get(symbol, (None, None))
+    
+    def _round_quantity(self, symbol: str, quantity: float) -> str:
+        """Round a quantity down to the symbol's lot size step."""
+        rounded = quantize(quantity, self._filters(_usym(symbol))[0])
+        if Decimal(rounded) <= 0:
+            raise ValueError(f"Quantity {quantity} is below the lot size step for {_usym(symbol)}")
+        return rounded
+    
+    def _round_price(self, symbol: str, price: float) -> str:
+        """Round a price down to the symbol's tick size."""
+        rounded = quantize(price, self._filters(_usym(symbol))[1])
+        if Decimal(rounded) <= 0:
+            raise ValueError(f"Price {price} is below the tick size for {_usym(symbol)}")
+        return rounded
+    
+    def prepare_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
+        """
+        Pre-build a signed market order draft for send_draft().
+        
+        Args:
+            symbol: Trading pair symbol
+            side: 'BUY' or 'SELL'
+            quantity: Order quantity
+            
+        Returns:
+            Draft dictionary
+        """
+        if _uside(side) not in SIDE_VALIDATOR:
+            raise ValueError("Side must be 'BUY' or 'SELL'")
+        
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        
+        return self._make_draft({
+            'symbol': _usym(symbol),
+            'side': _uside(side),
+            'type': 'MARKET',
+            'quantity': self._round_quantity(symbol, quantity)
+        })
+    
+    def prepare_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> Dict:
+        """
+        Pre-build a signed limit order draft for send_draft().
+        
+        Args:
+            symbol: Trading pair symbol
+            side: 'BUY' or 'SELL'
+            quantity: Order quantity
+            price: Limit price
+            
+        Returns:
+            Draft dictionary
+        """
+        if _uside(side) not in SIDE_VALIDATOR:
+            raise ValueError("Side must be 'BUY' or 'SELL'")
+        
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        
+        if price <= 0:
+            raise ValueError("Price must be positive")
+        
+        return self._make_draft({
+            'symbol': _usym(symbol),
+            'side': _uside(side),
+            'type': 'LIMIT',
+            'timeInForce': 'GTC',  # Good Till Cancelled
+            'quantity': self._round_quantity(symbol, quantity),
+            'price': self._round_price(symbol, price)
+        })
+    
+    def _make_draft(self, params: Dict) -> Dict:
+        """
+        Encode order parameters once and pre-feed them into an HMAC context,
+        leaving only the timestamp and signature for send time.
+        """
+        base_params = urlencode(sorted(params.items()))
+        mac = hmac.new(self.api_secret.encode(), base_params.encode(), hashlib.sha256)
+        return {
+            'url': f"{self.base_url}/fapi/v1/order",
+            'params': params,
+            'base_params': base_params,
+            'hmac': mac
+        }
+    
+    def send_draft(self, draft: Dict) -> Dict:
+        """
+        Send a draft built by prepare_market_order/prepare_limit_order.
+        
+        Args:
+            draft: Draft dictionary
+            
+        Returns:
+            Order response dictionary
+        """
+        start = time.perf_counter_ns()
+        suffix = f"&timestamp={int(time.time() * 1000)}"
+        mac = draft['hmac'].copy()
+        mac.update(suffix.encode())
+        body = f"{draft['base_params']}{suffix}&signature={mac.hexdigest()}"
+        self._record_latency('sign', start)
+        
+        response = self.client.session.post(
+            draft['url'],
+            data=body,
+            headers=self._draft_headers,
+            timeout=10
+        )
+        self._add_latency('round_trip', response.send_ns)
+        
+        start = time.perf_counter_ns()
+        order = self._handle_rest_response(response)
+        self._record_latency('parse', start)
+        return order
+    
     def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
         """
         Place a market order.
@@ -171,36 +951,81 @@ class BinanceFuturesBot:
             Order response dictionary
         """
         try:
-            # Validate inputs
-            if side.upper() not in ['BUY', 'SELL']:
-                raise ValueError("Side must be 'BUY' or 'SELL'")
-            
-            if quantity <= 0:
-                raise ValueError("Quantity must be positive")
-            
             # Place the order
-            order = self.client.futures_create_order(
-                symbol=symbol.upper(),
-                side=side.upper(),
-                type='MARKET',
-                quantity=quantity
-            )
+            start = time.perf_counter_ns()
+            draft = self.prepare_market_order(symbol, side, quantity)
+            self._record_latency('build_order', start)
+            order = self._call(self.send_draft, draft)
             
-            logger.info(f"Market order placed: {side} {quantity} {symbol}")
-            logger.info(f"Order ID: {order['orderId']}")
+            params = draft['params']
+            logger.info("Market order placed: %s %s %s", params['side'], params['quantity'], params['symbol'])
+            logger.info("Order ID: %s", order['orderId'])
+            self._invalidate_state()
             
             return order
             
         except BinanceAPIException as e:
-            logger.error(f"API error placing market order: {e}")
+            logger.error("API error placing market order: %s", e)
             raise
         except ValueError as e:
-            logger.error(f"Invalid input for market order: {e}")
+            logger.error("Invalid input for market order: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error placing market order: {e}")
+            logger.error("Unexpected error placing market order: %s", e)
             raise
     
+    def specialize_market(self, symbol: str, side: str) -> Callable[[float], Dict]:
+        """
+        Generate a market order function with symbol and side baked in, for
+        strategies that repeatedly trade the same pair.
+        
+        The fixed part of the query (side, symbol, type) is encoded and fed
+        into the HMAC once, and the lot size step is captured up front. Each
+        call only rounds the quantity, appends it to a copy of that HMAC
+        context and sends the result through send_draft() (with 429 retries),
+        skipping per-call validation, logging and latency stats. Quantities
+        that round to zero are rejected and cached account state is
+        invalidated after each order.
+        
+        Args:
+            symbol: Trading pair symbol
+            side: 'BUY' or 'SELL'
+            
+        Returns:
+            Function taking a quantity and returning the order response
+        """
+        symbol, side = _usym(symbol), _uside(side)
+        if side not in SIDE_VALIDATOR:
+            raise ValueError("Side must be 'BUY' or 'SELL'")
+        if not symbol.isalnum():
+            raise ValueError(f"Invalid symbol: {symbol}")
+        
+        code = (
+            "def market_order(quantity):\n"
+            "    qty = _quantize(quantity, _step)\n"
+            "    if quantity <= 0 or qty == '0':\n"
+            "        raise ValueError(f'Quantity {quantity} is below the lot size step for {_symbol}')\n"
+            "    mac = _mac.copy()\n"
+            "    mac.update(qty.encode())\n"
+            "    order = _call(_send, {'url': _url, 'base_params': _prefix + qty, 'hmac': mac})\n"
+            "    _invalidate()\n"
+            "    return order\n"
+        )
+        prefix = urlencode([('side', side), ('symbol', symbol), ('type', 'MARKET')]) + '&quantity='
+        namespace = {
+            '_quantize': quantize,
+            '_step': self._filters(symbol)[0],
+            '_symbol': symbol,
+            '_prefix': prefix,
+            '_mac': hmac.new(self.api_secret.encode(), prefix.encode(), hashlib.sha256),
+            '_url': f"{self.base_url}/fapi/v1/order",
+            '_call': self._call,
+            '_send': self.send_draft,
+            '_invalidate': self._invalidate_state
+        }
+        exec(code, namespace)
+        return namespace['market_order']
+    
     def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> Dict:
         """
         Place a limit order.
@@ -215,39 +1040,28 @@ class BinanceFuturesBot:
             Order response dictionary
         """
         try:
-            # Validate inputs
-            if side.upper() not in ['BUY', 'SELL']:
-                raise ValueError("Side must be 'BUY' or 'SELL'")
-            
-            if quantity <= 0:
-                raise ValueError("Quantity must be positive")
-            
-            if price <= 0:
-                raise ValueError("Price must be positive")
-            
             # Place the order
-            order = self.client.futures_create_order(
-                symbol=symbol.upper(),
-                side=side.upper(),
-                type='LIMIT',
-                timeInForce='GTC',  # Good Till Cancelled
-                quantity=quantity,
-                price=price
-            )
+            start = time.perf_counter_ns()
+            draft = self.prepare_limit_order(symbol, side, quantity, price)
+            self._record_latency('build_order', start)
+            order = self._call(self.send_draft, draft)
             
-            logger.info(f"Limit order placed: {side} {quantity} {symbol} at ${price}")
-            logger.info(f"Order ID: {order['orderId']}")
+            params = draft['params']
+            logger.info("Limit order placed: %s %s %s at $%s",
+                        params['side'], params['quantity'], params['symbol'], params['price'])
+            logger.info("Order ID: %s", order['orderId'])
+            self._invalidate_state()
             
             return order
             
         except BinanceAPIException as e:
-            logger.error(f"API error placing limit order: {e}")
+            logger.error("API error placing limit order: %s", e)
             raise
         except ValueError as e:
-            logger.error(f"Invalid input for limit order: {e}")
+            logger.error("Invalid input for limit order: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error placing limit order: {e}")
+            logger.error("Unexpected error placing limit order: %s", e)
             raise
     
     def place_stop_limit_order(self, symbol: str, side: str, quantity: float, 
@@ -267,7 +1081,7 @@ class BinanceFuturesBot:
         """
         try:
             # Validate inputs
-            if side.upper() not in ['BUY', 'SELL']:
+            if _uside(side) not in SIDE_VALIDATOR:
                 raise ValueError("Side must be 'BUY' or 'SELL'")
             
             if quantity <= 0:
@@ -276,31 +1090,39 @@ class BinanceFuturesBot:
             if stop_price <= 0 or limit_price <= 0:
                 raise ValueError("Stop price and limit price must be positive")
             
+            # Round to the exchange filters; these are the values sent and logged
+            quantity = self._round_quantity(symbol, quantity)
+            limit_price = self._round_price(symbol, limit_price)
+            stop_price = self._round_price(symbol, stop_price)
+            
             # Place the order
-            order = self.client.futures_create_order(
-                symbol=symbol.upper(),
-                side=side.upper(),
+            order = self._call(
+                self.client.futures_create_order,
+                symbol=_usym(symbol),
+                side=_uside(side),
                 type='STOP',
                 timeInForce='GTC',
                 quantity=quantity,
                 price=limit_price,
-                stopPrice=stop_price
+                stopPrice=stop_price,
+                _stage='create_order'
             )
             
-            logger.info(f"Stop-limit order placed: {side} {quantity} {symbol}")
-            logger.info(f"Stop: ${stop_price}, Limit: ${limit_price}")
-            logger.info(f"Order ID: {order['orderId']}")
+            logger.info("Stop-limit order placed: %s %s %s", _uside(side), quantity, _usym(symbol))
+            logger.info("Stop: $%s, Limit: $%s", stop_price, limit_price)
+            logger.info("Order ID: %s", order['orderId'])
+            self._invalidate_state()
             
             return order
             
         except BinanceAPIException as e:
-            logger.error(f"API error placing stop-limit order: {e}")
+            logger.error("API error placing stop-limit order: %s", e)
             raise
         except ValueError as e:
-            logger.error(f"Invalid input for stop-limit order: {e}")
+            logger.error("Invalid input for stop-limit order: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error placing stop-limit order: {e}")
+            logger.error("Unexpected error placing stop-limit order: %s", e)
             raise
     
     def get_order_status(self, symbol: str, order_id: int) -> Dict:
@@ -315,7 +1137,10 @@ class BinanceFuturesBot:
             Order status dictionary
         """
         try:
-            order = self.client.futures_get_order(symbol=symbol.upper(), orderId=order_id)
+            # Served from the user data stream when the order has been seen there
+            order = self._orders.get(order_id)
+            if not order or order['symbol'] != _usym(symbol):
+                order = self._call(self.client.futures_get_order, symbol=_usym(symbol), orderId=order_id)
             
             status_info = {
                 'orderId': order['orderId'],
@@ -327,17 +1152,17 @@ class BinanceFuturesBot:
                 'executedQty': order['executedQty'],
                 'price': order['price'],
                 'avgPrice': order['avgPrice'],
-                'time': datetime.fromtimestamp(order['time'] / 1000).strftime('%Y-%m-%d %H:%M:%S')
+                'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(order['time'] // 1000))
             }
             
-            logger.info(f"Order status retrieved: {order_id} - {status_info['status']}")
+            logger.info("Order status retrieved: %s - %s", order_id, status_info['status'])
             return status_info
             
         except BinanceAPIException as e:
-            logger.error(f"API error getting order status: {e}")
+            logger.error("API error getting order status: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error getting order status: {e}")
+            logger.error("Unexpected error getting order status: %s", e)
             raise
     
     def cancel_order(self, symbol: str, order_id: int) -> Dict:
@@ -352,42 +1177,194 @@ class BinanceFuturesBot:
             Cancellation response dictionary
         """
         try:
-            result = self.client.futures_cancel_order(symbol=symbol.upper(), orderId=order_id)
-            logger.info(f"Order cancelled successfully: {order_id}")
+            result = self._call(self.client.futures_cancel_order, symbol=_usym(symbol), orderId=order_id,
+                                _stage='cancel_order')
+            logger.info("Order cancelled successfully: %s", order_id)
+            self._invalidate_state()
             return result
             
         except BinanceAPIException as e:
-            logger.error(f"API error cancelling order: {e}")
+            logger.error("API error cancelling order: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error cancelling order: {e}")
+            logger.error("Unexpected error cancelling order: %s", e)
             raise
     
-    def get_open_orders(self, symbol: str = None) -> List[Dict]:
+    def get_open_orders(self, symbol: str = None, max_age: float = STATE_TTL) -> List[Dict]:
         """
         Get all open orders, optionally filtered by symbol.
         
         Args:
             symbol: Optional symbol filter
+            max_age: Maximum age in seconds of a refresh_state() snapshot to reuse
             
         Returns:
             List of open orders
         """
         try:
-            if symbol:
-                orders = self.client.futures_get_open_orders(symbol=symbol.upper())
+            state = self._fresh_state(max_age)
+            if state:
+                orders = state['open_orders']
+                if symbol:
+                    orders = [order for order in orders if order['symbol'] == _usym(symbol)]
+            elif symbol:
+                orders = self._call(self.client.futures_get_open_orders, symbol=_usym(symbol))
             else:
-                orders = self.client.futures_get_open_orders()
+                orders = self._call(self.client.futures_get_open_orders)
             
-            logger.info(f"Retrieved {len(orders)} open orders")
+            logger.info("Retrieved %s open orders", len(orders))
             return orders
             
         except BinanceAPIException as e:
-            logger.error(f"API error getting open orders: {e}")
+            logger.error("API error getting open orders: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error getting open orders: %s", e)
+            raise
+    
+    def get_open_orders_many(self, symbols: List[str]) -> List[Dict]:
+        """
+        Get open orders for several symbols concurrently.
+        
+        Args:
+            symbols: Trading pair symbols
+            
+        Returns:
+            Combined list of open orders
+        """
+        return self.run_async(self.aget_open_orders_many(symbols))
+    
+    async def aget_current_price(self, symbol: str) -> float:
+        """
+        Get current price for a symbol (async).
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            
+        Returns:
+            Current price as float
+        """
+        try:
+            ticker = await self._arequest('GET', '/fapi/v1/ticker/price', {'symbol': _usym(symbol)})
+            price = float(ticker['price'])
+            self._price_cache[_usym(symbol)] = (price, time.monotonic() + PRICE_CACHE_TTL)
+            logger.info("Current price for %s: $%.2f", symbol, price)
+            return price
+            
+        except BinanceAPIException as e:
+            logger.error("API error getting price for %s: %s", symbol, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error getting open orders: {e}")
+            logger.error("Unexpected error getting price for %s: %s", symbol, e)
             raise
+    
+    async def aplace_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
+        """
+        Place a market order (async).
+        
+        Args:
+            symbol: Trading pair symbol
+            side: 'BUY' or 'SELL'
+            quantity: Order quantity
+            
+        Returns:
+            Order response dictionary
+        """
+        try:
+            # Validate inputs
+            if _uside(side) not in SIDE_VALIDATOR:
+                raise ValueError("Side must be 'BUY' or 'SELL'")
+            
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            
+            # Exchange info is a large blocking fetch on first use; keep it off the loop
+            await asyncio.to_thread(self._filters, _usym(symbol))
+            quantity = self._round_quantity(symbol, quantity)
+            order = await self._arequest('POST', '/fapi/v1/order', {
+                'symbol': _usym(symbol),
+                'side': _uside(side),
+                'type': 'MARKET',
+                'quantity': quantity
+            }, signed=True)
+            
+            logger.info("Market order placed: %s %s %s", _uside(side), quantity, _usym(symbol))
+            logger.info("Order ID: %s", order['orderId'])
+            self._invalidate_state()
+            
+            return order
+            
+        except BinanceAPIException as e:
+            logger.error("API error placing market order: %s", e)
+            raise
+        except ValueError as e:
+            logger.error("Invalid input for market order: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error placing market order: %s", e)
+            raise
+    
+    async def acancel_order(self, symbol: str, order_id: int) -> Dict:
+        """
+        Cancel an open order (async).
+        
+        Args:
+            symbol: Trading pair symbol
+            order_id: Order ID to cancel
+            
+        Returns:
+            Cancellation response dictionary
+        """
+        try:
+            result = await self._arequest('DELETE', '/fapi/v1/order',
+                                          {'symbol': _usym(symbol), 'orderId': order_id}, signed=True)
+            logger.info("Order cancelled successfully: %s", order_id)
+            self._invalidate_state()
+            return result
+            
+        except BinanceAPIException as e:
+            logger.error("API error cancelling order: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error cancelling order: %s", e)
+            raise
+    
+    async def aget_open_orders(self, symbol: str = None) -> List[Dict]:
+        """
+        Get all open orders, optionally filtered by symbol (async).
+        
+        Args:
+            symbol: Optional symbol filter
+            
+        Returns:
+            List of open orders
+        """
+        try:
+            params = {'symbol': _usym(symbol)} if symbol else {}
+            orders = await self._arequest('GET', '/fapi/v1/openOrders', params, signed=True)
+            
+            logger.info("Retrieved %s open orders", len(orders))
+            return orders
+            
+        except BinanceAPIException as e:
+            logger.error("API error getting open orders: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error getting open orders: %s", e)
+            raise
+    
+    async def aget_open_orders_many(self, symbols: List[str]) -> List[Dict]:
+        """
+        Fetch open orders for several symbols in parallel.
+        
+        Args:
+            symbols: Trading pair symbols
+            
+        Returns:
+            Combined list of open orders
+        """
+        results = await asyncio.gather(*(self.aget_open_orders(symbol) for symbol in symbols))
+        return [order for orders in results for order in orders]
 
 def display_menu():
     """Display the main menu options."""
@@ -403,9 +1380,43 @@ def display_menu():
     print("7. Cancel Order")
     print("8. View Open Orders")
     print("9. Exit")
+    print("10. Show Latency Stats")
     print("="*50)
 
-def get_user_input(prompt: str, input_type: type = str, validation_func=None):
+# Input validators and completers shared by all menu prompts
+SIDE_COMPLETER = WordCompleter(sorted(SIDE_VALIDATOR), ignore_case=True)
+
+def is_valid_side(value: str) -> bool:
+    """Check that an order side is BUY or SELL (case-insensitive)."""
+    return _uside(value) in SIDE_VALIDATOR
+
+def is_positive(value: float) -> bool:
+    """Check that a number is positive."""
+    return value > 0
+
+_prompt_session: Optional[PromptSession] = None
+
+# One line of the open orders listing
+OPEN_ORDER_FORMAT = "ID: %s | %s | %s | %s | Qty: %s | Price: $%s | Status: %s"
+
+def read_line(prompt: str, completer: Optional[WordCompleter] = None, secret: bool = False) -> str:
+    """
+    Read a line through a persistent prompt_toolkit session (shared history,
+    optional completion), falling back to input() when stdin is not a terminal.
+    Secrets are read masked through a one-off session so they never enter
+    the shared history.
+    """
+    global _prompt_session
+    if not sys.stdin.isatty():
+        return input(prompt)
+    if secret:
+        return PromptSession().prompt(prompt, is_password=True)
+    if _prompt_session is None:
+        _prompt_session = PromptSession(history=InMemoryHistory())
+    return _prompt_session.prompt(prompt, completer=completer)
+
+def get_user_input(prompt: str, input_type: type = str, validation_func=None,
+                   completer: Optional[WordCompleter] = None, secret: bool = False):
     """
     Get user input with type validation and optional custom validation.
     
@@ -413,13 +1424,15 @@ def get_user_input(prompt: str, input_type: type = str, validation_func=None):
         prompt: Input prompt message
         input_type: Expected input type (str, int, float)
         validation_func: Optional validation function
+        completer: Optional prompt_toolkit completer
+        secret: Mask the input and keep it out of the prompt history
         
     Returns:
         Validated user input
     """
     while True:
         try:
-            user_input = input(prompt).strip()
+            user_input = read_line(prompt, completer, secret).strip()
             
             if input_type == str:
                 result = user_input
@@ -438,36 +1451,65 @@ def get_user_input(prompt: str, input_type: type = str, validation_func=None):
             
         except ValueError as e:
             print(f"Invalid input: {e}. Please try again.")
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\nOperation cancelled by user.")
             return None
 
+# Account summary rows: (label, account_info key)
+ACCOUNT_SUMMARY_FIELDS = [
+    ("Total Wallet Balance:    ", 'total_wallet_balance'),
+    ("Total Margin Balance:    ", 'total_margin_balance'),
+    ("Available Balance:       ", 'available_balance'),
+    ("Total Unrealized PnL:    ", 'total_unrealized_pnl'),
+    ("Max Withdraw Amount:     ", 'max_withdraw_amount'),
+]
+
+def _format_amounts(values: np.ndarray) -> np.ndarray:
+    """Format a float array as thousands-separated strings with 2 decimals."""
+    return np.array([f"{value:,.2f}" for value in values.tolist()], dtype=str)
+
 def format_account_info(account_info: Dict) -> None:
     """Format and display account information."""
     print("\n" + "="*50)
     print("           ACCOUNT INFORMATION")
     print("="*50)
-    print(f"Total Wallet Balance:    ${float(account_info['total_wallet_balance']):,.2f}")
-    print(f"Total Margin Balance:    ${float(account_info['total_margin_balance']):,.2f}")
-    print(f"Available Balance:       ${float(account_info['available_balance']):,.2f}")
-    print(f"Total Unrealized PnL:    ${float(account_info['total_unrealized_pnl']):,.2f}")
-    print(f"Max Withdraw Amount:     ${float(account_info['max_withdraw_amount']):,.2f}")
+    totals = np.asarray([account_info[key] for _, key in ACCOUNT_SUMMARY_FIELDS], dtype=np.float64)
+    for (label, _), amount in zip(ACCOUNT_SUMMARY_FIELDS, _format_amounts(totals)):
+        print(f"{label}${amount}")
     
-    if account_info['positions']:
+    positions = account_info['positions']
+    if positions['symbol'].size:
         print("\nCurrent Positions:")
         print("-" * 50)
-        for pos in account_info['positions']:
-            pnl = float(pos['unrealized_pnl'])
-            pnl_color = "+" if pnl >= 0 else ""
-            print(f"Symbol: {pos['symbol']}")
-            print(f"  Size: {pos['size']}")
-            print(f"  Entry Price: ${float(pos['entry_price']):,.2f}")
-            print(f"  Unrealized PnL: {pnl_color}{pnl:,.2f}")
-            print(f"  Percentage: {pos['percentage']}%")
-            print("-" * 30)
+        pnl = positions['unrealized_pnl']
+        lines = np.char.add("Symbol: ", positions['symbol'])
+        lines = np.char.add(lines, "\n  Size: ")
+        lines = np.char.add(lines, positions['size'])
+        lines = np.char.add(lines, "\n  Entry Price: $")
+        lines = np.char.add(lines, _format_amounts(positions['entry_price']))
+        lines = np.char.add(lines, "\n  Unrealized PnL: ")
+        lines = np.char.add(lines, np.where(pnl >= 0, "+", ""))
+        lines = np.char.add(lines, _format_amounts(pnl))
+        lines = np.char.add(lines, "\n  Percentage: ")
+        lines = np.char.add(lines, positions['percentage'])
+        lines = np.char.add(lines, "%\n" + "-" * 30)
+        print("\n".join(lines.tolist()))
     else:
         print("\nNo open positions.")
 
+def format_latency_stats(stats: Dict[str, Dict]) -> None:
+    """Format and display per-stage latency statistics."""
+    print("\n" + "="*50)
+    print("           LATENCY STATS")
+    print("="*50)
+    if not stats:
+        print("No requests timed yet.")
+        return
+    print(f"{'Stage':<15}{'Ops':>8}{'Avg (us)':>13}{'Max (us)':>13}")
+    print("-" * 50)
+    for stage, stat in stats.items():
+        print(f"{stage:<15}{stat['operations']:>8}{stat['avg_us']:>13,.1f}{stat['max_us']:>13,.1f}")
+
 def format_order_info(order: Dict) -> None:
     """Format and display order information."""
     print("\n" + "="*40)
@@ -485,6 +1527,179 @@ def format_order_info(order: Dict) -> None:
         print(f"Average Price:   ${float(order['avgPrice']):,.2f}")
     print(f"Time:            {order['time']}")
 
+def handle_account_info(bot: BinanceFuturesBot) -> None:
+    """Menu option 1: View Account Information."""
+    try:
+        bot.refresh_state()
+        account_info = bot.get_account_info()
+        format_account_info(account_info)
+    except Exception as e:
+        print(f"Error getting account info: {e}")
+
+def handle_current_price(bot: BinanceFuturesBot) -> None:
+    """Menu option 2: Get Current Price."""
+    symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
+    if symbol:
+        try:
+            price = bot.get_current_price(symbol)
+            print(f"\n💰 Current price for {_usym(symbol)}: ${price:,.2f}")
+        except Exception as e:
+            print(f"Error getting price: {e}")
+
+def handle_market_order(bot: BinanceFuturesBot) -> None:
+    """Menu option 3: Place Market Order."""
+    print("\n--- Place Market Order ---")
+    symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
+    if not symbol:
+        return
+    
+    side = get_user_input("Enter side (BUY/SELL): ", str,
+                          is_valid_side, SIDE_COMPLETER)
+    if not side:
+        return
+    
+    quantity = get_user_input("Enter quantity: ", float, is_positive)
+    if not quantity:
+        return
+    
+    try:
+        order = bot.place_market_order(symbol, side, quantity)
+        print(f"✅ Market order placed successfully!")
+        print(f"Order ID: {order['orderId']}")
+    except Exception as e:
+        print(f"❌ Error placing market order: {e}")
+
+def handle_limit_order(bot: BinanceFuturesBot) -> None:
+    """Menu option 4: Place Limit Order."""
+    print("\n--- Place Limit Order ---")
+    symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
+    if not symbol:
+        return
+    
+    side = get_user_input("Enter side (BUY/SELL): ", str,
+                          is_valid_side, SIDE_COMPLETER)
+    if not side:
+        return
+    
+    quantity = get_user_input("Enter quantity: ", float, is_positive)
+    if not quantity:
+        return
+    
+    price = get_user_input("Enter limit price: ", float, is_positive)
+    if not price:
+        return
+    
+    try:
+        order = bot.place_limit_order(symbol, side, quantity, price)
+        print(f"✅ Limit order placed successfully!")
+        print(f"Order ID: {order['orderId']}")
+    except Exception as e:
+        print(f"❌ Error placing limit order: {e}")
+
+def handle_stop_limit_order(bot: BinanceFuturesBot) -> None:
+    """Menu option 5: Place Stop-Limit Order."""
+    print("\n--- Place Stop-Limit Order ---")
+    symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
+    if not symbol:
+        return
+    
+    side = get_user_input("Enter side (BUY/SELL): ", str,
+                          is_valid_side, SIDE_COMPLETER)
+    if not side:
+        return
+    
+    quantity = get_user_input("Enter quantity: ", float, is_positive)
+    if not quantity:
+        return
+    
+    stop_price = get_user_input("Enter stop price: ", float, is_positive)
+    if not stop_price:
+        return
+    
+    limit_price = get_user_input("Enter limit price: ", float, is_positive)
+    if not limit_price:
+        return
+    
+    try:
+        order = bot.place_stop_limit_order(symbol, side, quantity, stop_price, limit_price)
+        print(f"✅ Stop-limit order placed successfully!")
+        print(f"Order ID: {order['orderId']}")
+    except Exception as e:
+        print(f"❌ Error placing stop-limit order: {e}")
+
+def handle_order_status(bot: BinanceFuturesBot) -> None:
+    """Menu option 6: Check Order Status."""
+    symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
+    if not symbol:
+        return
+    
+    order_id = get_user_input("Enter order ID: ", int)
+    if not order_id:
+        return
+    
+    try:
+        order_status = bot.get_order_status(symbol, order_id)
+        format_order_info(order_status)
+    except Exception as e:
+        print(f"Error getting order status: {e}")
+
+def handle_cancel_order(bot: BinanceFuturesBot) -> None:
+    """Menu option 7: Cancel Order."""
+    symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
+    if not symbol:
+        return
+    
+    order_id = get_user_input("Enter order ID to cancel: ", int)
+    if not order_id:
+        return
+    
+    try:
+        result = bot.cancel_order(symbol, order_id)
+        print(f"✅ Order {order_id} cancelled successfully!")
+    except Exception as e:
+        print(f"❌ Error cancelling order: {e}")
+
+def handle_open_orders(bot: BinanceFuturesBot) -> None:
+    """Menu option 8: View Open Orders."""
+    symbol = get_user_input("Enter symbol(s), comma-separated (optional, press Enter for all): ", str)
+    symbols = [s.strip() for s in symbol.split(',') if s.strip()] if symbol else []
+    
+    try:
+        if len(symbols) > 1:
+            orders = bot.get_open_orders_many(symbols)
+        else:
+            orders = bot.get_open_orders(symbols[0] if symbols else None)
+        if orders:
+            print(f"\n📋 Open Orders ({len(orders)} total):")
+            print("="*60)
+            lines = [
+                OPEN_ORDER_FORMAT % (o['orderId'], o['symbol'], o['side'], o['type'], o['origQty'],
+                                     format(float(o['price']), ',.2f'), o['status'])
+                for o in orders
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
+        else:
+            print("No open orders found.")
+    except Exception as e:
+        print(f"Error getting open orders: {e}")
+
+def handle_latency_stats(bot: BinanceFuturesBot) -> None:
+    """Menu option 10: Show Latency Stats."""
+    format_latency_stats(bot.get_latency_stats())
+
+# Menu choice -> handler (9 exits the loop)
+MENU_HANDLERS = {
+    1: handle_account_info,
+    2: handle_current_price,
+    3: handle_market_order,
+    4: handle_limit_order,
+    5: handle_stop_limit_order,
+    6: handle_order_status,
+    7: handle_cancel_order,
+    8: handle_open_orders,
+    10: handle_latency_stats,
+}
+
 def main():
     """Main application loop."""
     print("Welcome to Binance Futures Trading Bot!")
@@ -501,17 +1716,18 @@ def main():
         print("BINANCE_API_SECRET=your_api_secret_here")
         print("\nAlternatively, enter them now:")
         
-        api_key = get_user_input("Enter your Binance API Key: ")
+        api_key = get_user_input("Enter your Binance API Key: ", secret=True)
         if not api_key:
             return
             
-        api_secret = get_user_input("Enter your Binance API Secret: ")
+        api_secret = get_user_input("Enter your Binance API Secret: ", secret=True)
         if not api_secret:
             return
     
     # Initialize the trading bot
     try:
-        bot = BinanceFuturesBot(api_key, api_secret, testnet=True)
+        bot = BinanceFuturesBot(api_key, api_secret, testnet=True,
+                                endpoint_ip=os.getenv('BINANCE_ENDPOINT_IP') or None)
         print("✅ Successfully connected to Binance Futures Testnet!")
     except Exception as e:
         print(f"❌ Failed to connect to Binance: {e}")
@@ -521,175 +1737,30 @@ def main():
     while True:
         try:
             display_menu()
-            choice = get_user_input("Enter your choice (1-9): ", int)
+            choice = get_user_input("Enter your choice (1-10): ", int)
             
             if choice is None:  # User pressed Ctrl+C
                 break
             
-            if choice == 1:
-                # View Account Information
-                try:
-                    account_info = bot.get_account_info()
-                    format_account_info(account_info)
-                except Exception as e:
-                    print(f"Error getting account info: {e}")
-            
-            elif choice == 2:
-                # Get Current Price
-                symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
-                if symbol:
-                    try:
-                        price = bot.get_current_price(symbol)
-                        print(f"\n💰 Current price for {symbol.upper()}: ${price:,.2f}")
-                    except Exception as e:
-                        print(f"Error getting price: {e}")
-            
-            elif choice == 3:
-                # Place Market Order
-                print("\n--- Place Market Order ---")
-                symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
-                if not symbol:
-                    continue
-                
-                side = get_user_input("Enter side (BUY/SELL): ", str, 
-                                    lambda x: x.upper() in ['BUY', 'SELL'])
-                if not side:
-                    continue
-                
-                quantity = get_user_input("Enter quantity: ", float, lambda x: x > 0)
-                if not quantity:
-                    continue
-                
-                try:
-                    order = bot.place_market_order(symbol, side, quantity)
-                    print(f"✅ Market order placed successfully!")
-                    print(f"Order ID: {order['orderId']}")
-                except Exception as e:
-                    print(f"❌ Error placing market order: {e}")
-            
-            elif choice == 4:
-                # Place Limit Order
-                print("\n--- Place Limit Order ---")
-                symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
-                if not symbol:
-                    continue
-                
-                side = get_user_input("Enter side (BUY/SELL): ", str, 
-                                    lambda x: x.upper() in ['BUY', 'SELL'])
-                if not side:
-                    continue
-                
-                quantity = get_user_input("Enter quantity: ", float, lambda x: x > 0)
-                if not quantity:
-                    continue
-                
-                price = get_user_input("Enter limit price: ", float, lambda x: x > 0)
-                if not price:
-                    continue
-                
-                try:
-                    order = bot.place_limit_order(symbol, side, quantity, price)
-                    print(f"✅ Limit order placed successfully!")
-                    print(f"Order ID: {order['orderId']}")
-                except Exception as e:
-                    print(f"❌ Error placing limit order: {e}")
-            
-            elif choice == 5:
-                # Place Stop-Limit Order
-                print("\n--- Place Stop-Limit Order ---")
-                symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
-                if not symbol:
-                    continue
-                
-                side = get_user_input("Enter side (BUY/SELL): ", str, 
-                                    lambda x: x.upper() in ['BUY', 'SELL'])
-                if not side:
-                    continue
-                
-                quantity = get_user_input("Enter quantity: ", float, lambda x: x > 0)
-                if not quantity:
-                    continue
-                
-                stop_price = get_user_input("Enter stop price: ", float, lambda x: x > 0)
-                if not stop_price:
-                    continue
-                
-                limit_price = get_user_input("Enter limit price: ", float, lambda x: x > 0)
-                if not limit_price:
-                    continue
-                
-                try:
-                    order = bot.place_stop_limit_order(symbol, side, quantity, stop_price, limit_price)
-                    print(f"✅ Stop-limit order placed successfully!")
-                    print(f"Order ID: {order['orderId']}")
-                except Exception as e:
-                    print(f"❌ Error placing stop-limit order: {e}")
-            
-            elif choice == 6:
-                # Check Order Status
-                symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
-                if not symbol:
-                    continue
-                
-                order_id = get_user_input("Enter order ID: ", int)
-                if not order_id:
-                    continue
-                
-                try:
-                    order_status = bot.get_order_status(symbol, order_id)
-                    format_order_info(order_status)
-                except Exception as e:
-                    print(f"Error getting order status: {e}")
-            
-            elif choice == 7:
-                # Cancel Order
-                symbol = get_user_input("Enter symbol (e.g., BTCUSDT): ", str)
-                if not symbol:
-                    continue
-                
-                order_id = get_user_input("Enter order ID to cancel: ", int)
-                if not order_id:
-                    continue
-                
-                try:
-                    result = bot.cancel_order(symbol, order_id)
-                    print(f"✅ Order {order_id} cancelled successfully!")
-                except Exception as e:
-                    print(f"❌ Error cancelling order: {e}")
-            
-            elif choice == 8:
-                # View Open Orders
-                symbol = get_user_input("Enter symbol (optional, press Enter for all): ", str)
-                symbol = symbol if symbol else None
-                
-                try:
-                    orders = bot.get_open_orders(symbol)
-                    if orders:
-                        print(f"\n📋 Open Orders ({len(orders)} total):")
-                        print("="*60)
-                        for order in orders:
-                            print(f"ID: {order['orderId']} | {order['symbol']} | {order['side']} | "
-                                  f"{order['type']} | Qty: {order['origQty']} | "
-                                  f"Price: ${float(order['price']):,.2f} | Status: {order['status']}")
-                    else:
-                        print("No open orders found.")
-                except Exception as e:
-                    print(f"Error getting open orders: {e}")
-            
-            elif choice == 9:
+            if choice == 9:
                 # Exit
                 print("Thank you for using Binance Futures Trading Bot!")
                 break
             
+            handler = MENU_HANDLERS.get(choice)
+            if handler:
+                handler(bot)
             else:
-                print("Invalid choice. Please select a number between 1 and 9.")
+                print("Invalid choice. Please select a number between 1 and 10.")
                 
         except KeyboardInterrupt:
             print("\n\nExiting application...")
             break
         except Exception as e:
             print(f"Unexpected error: {e}")
-            logger.error(f"Unexpected error in main loop: {e}")
+            logger.error("Unexpected error in main loop: %s", e)
+    
+    bot.close()
 
 if __name__ == "__main__":
     main()